@@ -2,14 +2,24 @@
 
 import json
 import logging
+import os
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Deque, Iterable, List, Optional
+
+# Reused for every write; json.dump() with non-default options builds a new
+# encoder on each call. Compact output keeps the C encoder on its fast path.
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
 
 
 class CacheManager:
     """Manager for caching AI-generated messages."""
 
+    # Number of sent messages kept for prompt context
+    SENT_HISTORY_SIZE = 20
+
     def __init__(
             self,
             cache_dir: str,
@@ -31,10 +41,25 @@ class CacheManager:
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
         self.cache_file = self.cache_dir / "messages.json"
-        self.sent_file = self.cache_dir / "sent_messages.json"
+        self.sent_file = self.cache_dir / "sent_messages.jsonl"
+        self._legacy_sent_file = self.cache_dir / "sent_messages.json"
+        self._sent_lines = 0
+
+        # Write-back state for batch()
+        self._batch_depth = 0
+        self._dirty = False
+
+        # mtime of messages.json as last read or written by us
+        self._cache_mtime_ns = 0
+
         self._ensure_cache_file()
         self._ensure_sent_file()
 
+        # Keep both lists in memory; disk is only touched on mutation
+        self._cache: Deque[dict] = deque(self._read_cache())
+        self._sent: List[dict] = self._read_sent()
+        self._compact_sent_if_needed()
+
     def _ensure_cache_file(self):
         """Ensure cache file exists with proper structure."""
         if not self.cache_file.exists():
@@ -42,10 +67,49 @@ class CacheManager:
             self.logger.info("Created new cache file")
 
     def _ensure_sent_file(self):
-        """Ensure sent messages file exists with proper structure."""
-        if not self.sent_file.exists():
-            self._write_sent([])
-            self.logger.info("Created new sent messages file")
+        """Ensure sent messages log exists, migrating the old JSON file if present."""
+        if self.sent_file.exists():
+            return
+
+        if self._legacy_sent_file.exists():
+            try:
+                with open(self._legacy_sent_file, 'r', encoding='utf-8') as f:
+                    legacy = json.load(f)
+            except json.JSONDecodeError as e:
+                self.logger.warning(f"Could not migrate {self._legacy_sent_file.name}: {e}")
+                legacy = []
+
+            if not isinstance(legacy, list):
+                legacy = []
+
+            self._write_sent(legacy[-self.SENT_HISTORY_SIZE:])
+            self._legacy_sent_file.unlink()
+            self.logger.info(f"Migrated {len(legacy)} sent messages to {self.sent_file.name}")
+            return
+
+        self._write_sent([])
+        self.logger.info("Created new sent messages file")
+
+    def _stat_cache_mtime(self) -> int:
+        """Get the cache file's modification time.
+
+        Returns:
+            Modification time in nanoseconds, or 0 if the file is missing
+        """
+        try:
+            return os.stat(self.cache_file).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def _refresh_cache(self):
+        """Reload the in-memory cache if messages.json was changed externally."""
+        if self._dirty:
+            # Unflushed changes win over external edits
+            return
+
+        if self._stat_cache_mtime() != self._cache_mtime_ns:
+            self.logger.info("Cache file changed on disk, reloading")
+            self._cache = deque(self._read_cache())
 
     def _read_cache(self) -> List[dict]:
         """Read cache from file with validation.
@@ -53,86 +117,197 @@ class CacheManager:
         Returns:
             List of cached message entries
         """
+        self._cache_mtime_ns = self._stat_cache_mtime()
         try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                cache = json.load(f)
-
-                # Validate cache structure
-                if not isinstance(cache, list):
-                    self.logger.error(f"Invalid cache structure: expected list, got {type(cache)}")
-                    return []
-
-                # Validate each entry
-                valid_cache = []
-                for i, entry in enumerate(cache):
-                    if not isinstance(entry, dict):
-                        self.logger.warning(f"Skipping invalid entry at index {i}: not a dict")
-                        continue
+            # One read() of the raw bytes; json.loads detects UTF-8 itself
+            cache = json.loads(self.cache_file.read_bytes())
+        except (json.JSONDecodeError, UnicodeDecodeError, FileNotFoundError) as e:
+            self.logger.error(f"Error reading cache: {e}")
+            return []
 
-                    if "message" not in entry:
-                        self.logger.warning(f"Skipping invalid entry at index {i}: missing 'message' key")
-                        continue
+        # Validate cache structure
+        if not isinstance(cache, list):
+            self.logger.error(f"Invalid cache structure: expected list, got {type(cache)}")
+            return []
 
-                    if not isinstance(entry["message"], str):
-                        self.logger.warning(f"Skipping invalid entry at index {i}: 'message' is not a string")
-                        continue
+        # Fast path: nothing to drop, nothing to rewrite
+        if all(self._entry_problem(entry) is None for entry in cache):
+            return cache
 
-                    # Additional check: message should not be empty
-                    if not entry["message"].strip():
-                        self.logger.warning(f"Skipping invalid entry at index {i}: empty message")
-                        continue
+        # Validate each entry
+        valid_cache = []
+        for i, entry in enumerate(cache):
+            problem = self._entry_problem(entry)
+            if problem:
+                self.logger.warning(f"Skipping invalid entry at index {i}: {problem}")
+                continue
 
-                    valid_cache.append(entry)
+            valid_cache.append(entry)
 
-                if len(valid_cache) < len(cache):
-                    self.logger.warning(f"Removed {len(cache) - len(valid_cache)} invalid entries from cache")
-                    # Save cleaned cache
-                    self._write_cache(valid_cache)
+        if len(valid_cache) < len(cache):
+            self.logger.warning(f"Removed {len(cache) - len(valid_cache)} invalid entries from cache")
+            # Save cleaned cache
+            self._write_cache(valid_cache)
 
-                return valid_cache
+        return valid_cache
 
-        except (json.JSONDecodeError, FileNotFoundError) as e:
-            self.logger.error(f"Error reading cache: {e}")
-            return []
+    @staticmethod
+    def _entry_problem(entry) -> Optional[str]:
+        """Describe why a cache entry is invalid.
+
+        Args:
+            entry: Decoded cache entry
+
+        Returns:
+            Reason the entry is invalid, or None if it is valid
+        """
+        if not isinstance(entry, dict):
+            return "not a dict"
+
+        if "message" not in entry:
+            return "missing 'message' key"
+
+        if not isinstance(entry["message"], str):
+            return "'message' is not a string"
+
+        # Additional check: message should not be empty
+        if not entry["message"].strip():
+            return "empty message"
+
+        return None
 
     def _read_sent(self) -> List[dict]:
-        """Read sent messages from file.
+        """Read the most recent sent messages from the append-only log.
 
         Returns:
-            List of sent message entries
+            List of sent message entries (at most SENT_HISTORY_SIZE)
         """
+        recent = deque(maxlen=self.SENT_HISTORY_SIZE)
+        self._sent_lines = 0
+
         try:
             with open(self.sent_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
+                # Hint the kernel to read ahead; the log is scanned front to back
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+                for line in f:
+                    self._sent_lines += 1
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        self.logger.warning(f"Skipping corrupt line {self._sent_lines} in sent messages log")
+                        continue
+
+                    if self._entry_problem(entry) is None:
+                        recent.append(entry)
+        except FileNotFoundError:
             return []
 
-    def _write_cache(self, cache: List[dict]):
+        return list(recent)
+
+    @staticmethod
+    def _atomic_write(path: Path, content: str, sync: bool = False):
+        """Replace a file's content without ever leaving it half-written.
+
+        The content goes to a temporary sibling file which is then renamed
+        over the target, so readers see either the old or the new file.
+
+        Args:
+            path: File to replace
+            content: New file content
+            sync: Whether to fsync the temporary file before the rename
+        """
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _write_cache(self, cache: Iterable[dict], sync: bool = False):
         """Write cache to file.
 
         Args:
-            cache: List of message entries to write
+            cache: Message entries to write, oldest first
+            sync: Whether to fsync the file before returning
         """
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache, f, indent=2, ensure_ascii=False)
+            self._atomic_write(self.cache_file, _JSON_ENCODER.encode(list(cache)), sync)
+            self._cache_mtime_ns = self._stat_cache_mtime()
         except Exception as e:
             self.logger.error(f"Error writing cache: {e}")
             raise
 
+    def _persist_cache(self):
+        """Write the in-memory cache to disk, or defer it while inside batch()."""
+        if self._batch_depth:
+            self._dirty = True
+            return
+
+        self._write_cache(self._cache)
+
+    @contextmanager
+    def batch(self):
+        """Defer cache writes until the outermost batch exits.
+
+        Mutations made inside the block are written to disk once, on exit.
+
+        Yields:
+            This cache manager
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
+
+    def flush(self, sync: bool = False):
+        """Write pending cache changes to disk.
+
+        Args:
+            sync: Also write when nothing is pending and fsync the file
+        """
+        if self._dirty or sync:
+            self._write_cache(self._cache, sync=sync)
+            self._dirty = False
+
     def _write_sent(self, sent: List[dict]):
-        """Write sent messages to file.
+        """Rewrite the sent messages log with the given entries.
 
         Args:
             sent: List of sent message entries to write
         """
         try:
-            with open(self.sent_file, 'w', encoding='utf-8') as f:
-                json.dump(sent, f, indent=2, ensure_ascii=False)
+            self._atomic_write(self.sent_file, ''.join(_JSON_ENCODER.encode(entry) + '\n' for entry in sent))
+            self._sent_lines = len(sent)
         except Exception as e:
             self.logger.error(f"Error writing sent messages: {e}")
             raise
 
+    def _append_sent(self, entry: dict):
+        """Append a single entry to the sent messages log.
+
+        Args:
+            entry: Sent message entry to append
+        """
+        try:
+            with open(self.sent_file, 'a', encoding='utf-8') as f:
+                f.write(_JSON_ENCODER.encode(entry) + '\n')
+            self._sent_lines += 1
+        except Exception as e:
+            self.logger.error(f"Error appending sent message: {e}")
+            raise
+
+    def _compact_sent_if_needed(self):
+        """Trim the sent messages log once it holds twice the kept history."""
+        if self._sent_lines > 2 * self.SENT_HISTORY_SIZE:
+            self._write_sent(self._sent)
+            self.logger.debug(f"Compacted sent messages log to {len(self._sent)} entries")
+
     def get_recent_sent_messages(self, count: int = 5) -> List[str]:
         """Get recent sent messages for context.
 
@@ -142,17 +317,15 @@ class CacheManager:
         Returns:
             List of recent message strings
         """
-        sent = self._read_sent()
-
         # If sent file is empty, use messages from cache instead
-        if not sent:
+        if not self._sent:
+            self._refresh_cache()
             self.logger.debug("No sent messages yet, using cached messages for context")
-            cache = self._read_cache()
-            messages = [entry["message"] for entry in cache[-count:]]
+            messages = [entry["message"] for entry in list(self._cache)[-count:]]
             return messages
 
         # Get last N messages
-        recent = sent[-count:]
+        recent = self._sent[-count:]
         messages = [entry["message"] for entry in recent]
 
         self.logger.debug(f"Retrieved {len(messages)} recent sent messages for context")
@@ -165,21 +338,20 @@ class CacheManager:
             message: The message that was sent
         """
         try:
-            sent = self._read_sent()
-
             entry = {
                 "message": message,
                 "timestamp": datetime.now().isoformat()
             }
 
-            sent.append(entry)
+            self._sent.append(entry)
 
-            # Keep only last 20 sent messages
-            if len(sent) > 20:
-                sent = sent[-20:]
+            # Keep only the last SENT_HISTORY_SIZE sent messages
+            if len(self._sent) > self.SENT_HISTORY_SIZE:
+                self._sent = self._sent[-self.SENT_HISTORY_SIZE:]
 
-            self._write_sent(sent)
-            self.logger.info(f"Marked message as sent (total sent: {len(sent)})")
+            self._append_sent(entry)
+            self._compact_sent_if_needed()
+            self.logger.info(f"Marked message as sent (total sent: {len(self._sent)})")
 
         except Exception as e:
             self.logger.error(f"Failed to mark message as sent: {e}")
@@ -193,33 +365,55 @@ class CacheManager:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            # Validate message
-            if not message or not isinstance(message, str):
-                self.logger.error(f"Invalid message: must be non-empty string")
-                return False
-
-            message = message.strip()
-            if not message:
-                self.logger.error(f"Invalid message: empty after stripping")
-                return False
+        return self.add_messages([message]) == 1
 
-            cache = self._read_cache()
+    def add_messages(self, messages: List[str]) -> int:
+        """Add several messages to the cache with a single write.
 
-            entry = {
-                "message": message,
-                "timestamp": datetime.now().isoformat()
-            }
+        All messages share one timestamp. Invalid messages are skipped.
 
-            cache.append(entry)
-            self._write_cache(cache)
+        Args:
+            messages: Messages to cache, oldest first
 
-            self.logger.info(f"Added message to cache (total: {len(cache)})")
-            return True
+        Returns:
+            Number of messages added
+        """
+        try:
+            timestamp = datetime.now().isoformat()
+            entries = []
+
+            for message in messages:
+                # Validate message
+                if not message or not isinstance(message, str):
+                    self.logger.error(f"Invalid message: must be non-empty string")
+                    continue
+
+                message = message.strip()
+                if not message:
+                    self.logger.error(f"Invalid message: empty after stripping")
+                    continue
+
+                entries.append({
+                    "message": message,
+                    "timestamp": timestamp
+                })
+
+            if not entries:
+                return 0
+
+            self._refresh_cache()
+            self._cache.extend(entries)
+            self._persist_cache()
+
+            if len(entries) == 1:
+                self.logger.info(f"Added message to cache (total: {len(self._cache)})")
+            else:
+                self.logger.info(f"Added {len(entries)} messages to cache (total: {len(self._cache)})")
+            return len(entries)
 
         except Exception as e:
             self.logger.error(f"Failed to add message to cache: {e}")
-            return False
+            return 0
 
     def get_oldest_message(self) -> Optional[str]:
         """Get and remove the oldest message from cache.
@@ -228,36 +422,36 @@ class CacheManager:
             Oldest cached message or None if cache is empty
         """
         try:
-            cache = self._read_cache()
+            self._refresh_cache()
+            cache = self._cache
 
             if not cache:
                 self.logger.warning("Cache is empty")
                 return None
 
-            # Get oldest message (first in list)
-            oldest = cache.pop(0)
-            message = oldest["message"]
-
-            # Validate message before returning
-            if not message or not isinstance(message, str):
-                self.logger.error(f"Retrieved invalid message from cache: {type(message)}")
-                # Try to get next message
-                self._write_cache(cache)
-                if cache:
-                    return self.get_oldest_message()
-                return None
+            # Take oldest messages (front of queue), dropping invalid ones
+            message = None
+            while cache:
+                oldest = cache.popleft()
+                candidate = oldest.get("message") if isinstance(oldest, dict) else None
 
-            message = message.strip()
-            if not message:
-                self.logger.error(f"Retrieved empty message from cache")
-                # Try to get next message
-                self._write_cache(cache)
-                if cache:
-                    return self.get_oldest_message()
-                return None
+                if not candidate or not isinstance(candidate, str):
+                    self.logger.error(f"Retrieved invalid message from cache: {type(candidate)}")
+                    continue
 
-            # Write updated cache
-            self._write_cache(cache)
+                candidate = candidate.strip()
+                if not candidate:
+                    self.logger.error("Retrieved empty message from cache")
+                    continue
+
+                message = candidate
+                break
+
+            # Write updated cache once, however many entries were dropped
+            self._persist_cache()
+
+            if message is None:
+                return None
 
             self.logger.info(f"Retrieved oldest message from cache (remaining: {len(cache)})")
             self.logger.debug(
@@ -275,8 +469,8 @@ class CacheManager:
         Returns:
             Number of cached messages
         """
-        cache = self._read_cache()
-        return len(cache)
+        self._refresh_cache()
+        return len(self._cache)
 
     def is_cache_full(self) -> bool:
         """Check if cache has reached target size.
@@ -298,7 +492,8 @@ class CacheManager:
 
     def clear_cache(self):
         """Clear all cached messages."""
-        self._write_cache([])
+        self._cache.clear()
+        self._persist_cache()
         self.logger.info("Cache cleared")
 
     def validate_and_repair_cache(self) -> bool:
@@ -308,24 +503,23 @@ class CacheManager:
             True if cache is valid or was repaired successfully
         """
         try:
-            cache = self._read_cache()
+            self._refresh_cache()
+            cache = self._cache
 
-            # Check for duplicates
+            # Check for duplicates (set.add() returns None, so the first
+            # occurrence of each message is kept)
             seen_messages = set()
-            unique_cache = []
-            duplicates = 0
-
-            for entry in cache:
-                msg = entry.get("message", "").strip()
-                if msg and msg not in seen_messages:
-                    seen_messages.add(msg)
-                    unique_cache.append(entry)
-                else:
-                    duplicates += 1
+            unique_cache = [
+                entry for entry in cache
+                if (msg := entry.get("message", "").strip())
+                and not (msg in seen_messages or seen_messages.add(msg))
+            ]
+            duplicates = len(cache) - len(unique_cache)
 
             if duplicates > 0:
                 self.logger.warning(f"Removed {duplicates} duplicate messages from cache")
-                self._write_cache(unique_cache)
+                self._cache = deque(unique_cache)
+                self._persist_cache()
 
             self.logger.info(f"Cache validation complete: {len(unique_cache)} valid unique messages")
             return True
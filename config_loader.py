@@ -5,6 +5,12 @@ from typing import Dict, Any, Optional
 
 import yaml
 
+# Stand-in for {recent_messages} while the static placeholders are filled in
+_RECENT_MESSAGES_MARKER = '\x00recent_messages\x00'
+
+_REQUIRED_SECTIONS = frozenset(('discord', 'llm', 'reminder', 'cache', 'logging', 'prompt'))
+_REMINDER_FIELDS = frozenset(('target_name', 'sender_name', 'book_title', 'time_range'))
+
 
 class Config:
     """Configuration loader and accessor."""
@@ -18,6 +24,9 @@ class Config:
         self.config_path = Path(config_path)
         self.config = self._load_config()
         self._validate_config()
+        self._resolve_settings()
+        self._prompt_parts = self._prepare_prompt()
+        self._flat = self._flatten(self.config)
 
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file.
@@ -31,34 +40,174 @@ class Config:
         with open(self.config_path, 'r', encoding='utf-8') as f:
             return yaml.safe_load(f)
 
+    @staticmethod
+    def _check_type(value: Any, expected, name: str):
+        """Raise if a configuration value has the wrong type.
+
+        Args:
+            value: Configuration value to check
+            expected: Type or tuple of types accepted
+            name: Dot-notation name used in the error message
+        """
+        # bool is an int subclass, but never a valid value for these fields
+        if isinstance(value, bool) or not isinstance(value, expected):
+            names = expected if isinstance(expected, tuple) else (expected,)
+            expected_name = ' or '.join(t.__name__ for t in names)
+            raise ValueError(f"Invalid {name}: expected {expected_name}, got {type(value).__name__}")
+
     def _validate_config(self):
-        """Validate required configuration fields."""
-        required_sections = ['discord', 'llm', 'reminder', 'cache', 'logging', 'prompt']
+        """Validate required configuration fields and their types."""
+        if not isinstance(self.config, dict):
+            raise ValueError("Config file must contain a YAML mapping")
+
+        missing = _REQUIRED_SECTIONS - self.config.keys()
+        if missing:
+            raise ValueError(f"Missing required config section(s): {', '.join(sorted(missing))}")
 
-        for section in required_sections:
-            if section not in self.config:
-                raise ValueError(f"Missing required config section: {section}")
+        for section in sorted(_REQUIRED_SECTIONS - {'prompt'}):
+            self._check_type(self.config[section], dict, section)
+        self._check_type(self.config['prompt'], str, 'prompt')
 
         # Validate Discord config
-        if 'main_webhook_url' not in self.config['discord']:
+        discord = self.config['discord']
+        if 'main_webhook_url' not in discord:
             raise ValueError("Missing discord.main_webhook_url")
+        self._check_type(discord['main_webhook_url'], str, 'discord.main_webhook_url')
 
         # Validate LLM config
-        if 'api_key' not in self.config['llm']:
+        llm = self.config['llm']
+        if 'api_key' not in llm:
             raise ValueError("Missing llm.api_key")
+        self._check_type(llm['api_key'], str, 'llm.api_key')
+        if 'max_tokens' in llm:
+            self._check_type(llm['max_tokens'], int, 'llm.max_tokens')
+        if 'temperature' in llm:
+            self._check_type(llm['temperature'], (int, float), 'llm.temperature')
+        if 'request_timeout' in llm:
+            self._check_type(llm['request_timeout'], (int, float), 'llm.request_timeout')
+        if 'max_concurrent' in llm:
+            self._check_type(llm['max_concurrent'], int, 'llm.max_concurrent')
+            if llm['max_concurrent'] < 1:
+                raise ValueError(f"Invalid llm.max_concurrent: must be at least 1, got {llm['max_concurrent']}")
+        if 'batch_prefill' in llm and not isinstance(llm['batch_prefill'], bool):
+            raise ValueError(f"Invalid llm.batch_prefill: expected bool, got {type(llm['batch_prefill']).__name__}")
+        if 'requests_per_minute' in llm:
+            self._check_type(llm['requests_per_minute'], int, 'llm.requests_per_minute')
+            if llm['requests_per_minute'] < 0:
+                raise ValueError(
+                    f"Invalid llm.requests_per_minute: must not be negative, got {llm['requests_per_minute']}")
 
         # Validate reminder config
-        reminder_fields = ['target_name', 'sender_name', 'book_title', 'time_range']
-        for field in reminder_fields:
-            if field not in self.config['reminder']:
-                raise ValueError(f"Missing reminder.{field}")
+        reminder = self.config['reminder']
+        missing = _REMINDER_FIELDS - reminder.keys()
+        if missing:
+            raise ValueError(f"Missing {', '.join('reminder.' + field for field in sorted(missing))}")
+
+        # Names and title go into the prompt via str(), so unquoted YAML
+        # scalars like `book_title: 1984` are fine
+        for field in sorted(_REMINDER_FIELDS - {'time_range'}):
+            value = reminder[field]
+            if value is None or isinstance(value, (dict, list)):
+                raise ValueError(f"Invalid reminder.{field}: expected text, got {type(value).__name__}")
 
         # Validate time_range structure
-        time_range = self.config['reminder']['time_range']
+        time_range = reminder['time_range']
+        self._check_type(time_range, dict, 'reminder.time_range')
         if 'start' not in time_range:
             raise ValueError("Missing reminder.time_range.start")
-        if self.config['reminder'].get('randomize_time', True) and 'end' not in time_range:
-            raise ValueError("Missing reminder.time_range.end (required when randomize_time is true)")
+        self._check_type(time_range['start'], str, 'reminder.time_range.start')
+        if reminder.get('randomize_time', True):
+            if 'end' not in time_range:
+                raise ValueError("Missing reminder.time_range.end (required when randomize_time is true)")
+            self._check_type(time_range['end'], str, 'reminder.time_range.end')
+
+        # Validate cache config
+        if 'cache_size' in self.config['cache']:
+            self._check_type(self.config['cache']['cache_size'], int, 'cache.cache_size')
+
+    def _resolve_settings(self):
+        """Resolve defaults once so properties are plain attribute reads."""
+        discord = self.config['discord']
+        llm = self.config['llm']
+        reminder = self.config['reminder']
+        cache = self.config['cache']
+        logging_cfg = self.config['logging']
+
+        self._discord_main_webhook = discord['main_webhook_url']
+        self._discord_debug_webhook = discord.get('debug_webhook_url', '')
+        self._discord_debug_level = discord.get('debug_level', 'error')
+
+        self._llm_provider = llm.get('provider', 'openai')
+        self._llm_api_key = llm['api_key']
+        self._llm_model = llm.get('model', 'gpt-4')
+        self._llm_max_tokens = llm.get('max_tokens', 500)
+        self._llm_temperature = llm.get('temperature', 0.9)
+        self._llm_request_timeout = llm.get('request_timeout', 30)
+        self._llm_max_concurrent = llm.get('max_concurrent')
+        self._llm_requests_per_minute = llm.get('requests_per_minute')
+        self._llm_batch_prefill = llm.get('batch_prefill', False)
+
+        # Provider-specific base_url, or None to use the provider default
+        provider_settings = llm.get(self._llm_provider)
+        if isinstance(provider_settings, dict):
+            self._llm_base_url = provider_settings.get('base_url')
+        else:
+            self._llm_base_url = None
+
+        self._cache_size = cache.get('cache_size', 10)
+        self._cache_dir = cache.get('cache_dir', 'cache')
+
+        self._log_dir = logging_cfg.get('log_dir', 'logs')
+        self._log_level = logging_cfg.get('log_level', 'INFO')
+        self._log_max_bytes = logging_cfg.get('max_bytes', 10485760)
+        self._log_backup_count = logging_cfg.get('backup_count', 5)
+        self._log_config = self.config.get('logging', {})
+
+        time_range = reminder.get('time_range', {})
+        self._time_randomize = reminder.get('randomize_time', True)
+        self._time_range_start = time_range.get('start', '14:00')
+        self._time_range_end = time_range.get('end', '17:00')
+
+    def _prepare_prompt(self) -> list:
+        """Fill in the static prompt placeholders once.
+
+        Only {recent_messages} changes between calls, so the template is
+        split around it and get_prompt() just joins the pieces.
+
+        Returns:
+            Prompt segments surrounding each {recent_messages} placeholder
+        """
+        reminder = self.config['reminder']
+        prompt = self.config['prompt'].format(
+            sender_name=reminder['sender_name'],
+            target_name=reminder['target_name'],
+            book_title=reminder['book_title'],
+            language=reminder.get('language', 'Polish'),
+            recent_messages=_RECENT_MESSAGES_MARKER
+        )
+        return prompt.split(_RECENT_MESSAGES_MARKER)
+
+    @staticmethod
+    def _flatten(config: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+        """Flatten nested configuration into dot-notation keys.
+
+        Every level is kept, so 'discord' maps to the whole section and
+        'discord.main_webhook_url' to the leaf value.
+
+        Args:
+            config: Nested configuration dictionary
+            prefix: Key prefix for the current nesting level
+
+        Returns:
+            Dictionary mapping dot-notation keys to values
+        """
+        flat = {}
+        for key, value in config.items():
+            full_key = f"{prefix}{key}"
+            flat[full_key] = value
+            if isinstance(value, dict):
+                flat.update(Config._flatten(value, f"{full_key}."))
+        return flat
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value by dot-notation key.
@@ -70,16 +219,7 @@ class Config:
         Returns:
             Configuration value
         """
-        keys = key.split('.')
-        value = self.config
-
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-
-        return value
+        return self._flat.get(key, default)
 
     def get_prompt(self, recent_messages: list = None) -> str:
         """Get formatted prompt with placeholders replaced.
@@ -90,123 +230,125 @@ class Config:
         Returns:
             Formatted prompt string
         """
-        prompt_template = self.config['prompt']
-
         # Format recent messages for context
         if recent_messages:
             messages_text = "\n".join([f"- {msg}" for msg in recent_messages])
         else:
             messages_text = "(No previous messages yet)"
 
-        return prompt_template.format(
-            sender_name=self.config['reminder']['sender_name'],
-            target_name=self.config['reminder']['target_name'],
-            book_title=self.config['reminder']['book_title'],
-            language=self.config['reminder'].get('language', 'Polish'),
-            recent_messages=messages_text
-        )
+        return messages_text.join(self._prompt_parts)
 
     @property
     def discord_main_webhook(self) -> str:
         """Get main Discord webhook URL."""
-        return self.config['discord']['main_webhook_url']
+        return self._discord_main_webhook
 
     @property
     def discord_debug_webhook(self) -> str:
         """Get debug Discord webhook URL."""
-        return self.config['discord'].get('debug_webhook_url', '')
+        return self._discord_debug_webhook
 
     @property
     def discord_debug_level(self) -> str:
         """Get debug notification level."""
-        return self.config['discord'].get('debug_level', 'error')
+        return self._discord_debug_level
 
     @property
     def llm_provider(self) -> str:
         """Get LLM provider."""
-        return self.config['llm'].get('provider', 'openai')
+        return self._llm_provider
 
     @property
     def llm_api_key(self) -> str:
         """Get LLM API key."""
-        return self.config['llm']['api_key']
+        return self._llm_api_key
 
     @property
     def llm_model(self) -> str:
         """Get LLM model name."""
-        return self.config['llm'].get('model', 'gpt-4')
+        return self._llm_model
 
     @property
     def llm_base_url(self) -> Optional[str]:
         """Get LLM API base URL based on provider."""
-        provider = self.llm_provider
-
-        # Check provider-specific settings first
-        if provider in self.config['llm'] and isinstance(self.config['llm'][provider], dict):
-            if 'base_url' in self.config['llm'][provider]:
-                return self.config['llm'][provider]['base_url']
-
-        # Return None to use provider default
-        return None
+        return self._llm_base_url
 
     @property
     def llm_max_tokens(self) -> int:
         """Get LLM max tokens."""
-        return self.config['llm'].get('max_tokens', 500)
+        return self._llm_max_tokens
 
     @property
     def llm_temperature(self) -> float:
         """Get LLM temperature."""
-        return self.config['llm'].get('temperature', 0.9)
+        return self._llm_temperature
+
+    @property
+    def llm_request_timeout(self) -> float:
+        """Get LLM request timeout in seconds."""
+        return self._llm_request_timeout
+
+    @property
+    def llm_max_concurrent(self) -> Optional[int]:
+        """Get maximum number of concurrent LLM requests, or None for the provider default."""
+        return self._llm_max_concurrent
+
+    @property
+    def llm_batch_prefill(self) -> bool:
+        """Get whether cache prefill first asks for all messages in one request."""
+        return self._llm_batch_prefill
+
+    @property
+    def llm_requests_per_minute(self) -> Optional[int]:
+        """Get client-side LLM request limit, or None for the provider default."""
+        return self._llm_requests_per_minute
 
     @property
     def cache_size(self) -> int:
         """Get cache size."""
-        return self.config['cache'].get('cache_size', 10)
+        return self._cache_size
 
     @property
     def cache_dir(self) -> str:
         """Get cache directory."""
-        return self.config['cache'].get('cache_dir', 'cache')
+        return self._cache_dir
 
     @property
     def log_dir(self) -> str:
         """Get log directory."""
-        return self.config['logging'].get('log_dir', 'logs')
+        return self._log_dir
 
     @property
     def log_level(self) -> str:
         """Get log level."""
-        return self.config['logging'].get('log_level', 'INFO')
+        return self._log_level
 
     @property
     def log_max_bytes(self) -> int:
         """Get log file max bytes."""
-        return self.config['logging'].get('max_bytes', 10485760)
+        return self._log_max_bytes
 
     @property
     def log_backup_count(self) -> int:
         """Get log backup count."""
-        return self.config['logging'].get('backup_count', 5)
+        return self._log_backup_count
 
     @property
     def log_config(self) -> Dict[str, Any]:
         """Get logging configuration dictionary."""
-        return self.config.get('logging', {})
+        return self._log_config
 
     @property
     def time_randomize(self) -> bool:
         """Get whether time should be randomized."""
-        return self.config['reminder'].get('randomize_time', True)
+        return self._time_randomize
 
     @property
     def time_range_start(self) -> str:
         """Get reminder time range start."""
-        time_range = self.config['reminder'].get('time_range', {})
-        return time_range.get('start', '14:00')
+        return self._time_range_start
 
     @property
     def time_range_end(self) -> str:
         """Get reminder time range end."""
-        time_range = self.config['reminder'].get('time_range', {})
-        return time_range.get('end', '17:00')
+        return self._time_range_end
@@ -1,10 +1,12 @@
 """Discord webhook integration module."""
 
 import requests
-import json
+import time
 from typing import Optional
 import logging
-from datetime import datetime
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 class DiscordWebhook:
@@ -37,6 +39,44 @@ class DiscordWebhook:
         self.debug_level = self.LEVEL_MAP.get(debug_level.lower(), logging.ERROR)
         self.logger = logger or logging.getLogger(__name__)
 
+        # Persistent session so webhook calls reuse the keep-alive connection
+        self._session = requests.Session()
+        # Webhook POSTs aren't idempotent: only retry when Discord can't have
+        # accepted the message (failed connect, or 429 rate limit)
+        retries = Retry(
+            total=3,
+            read=0,
+            other=0,
+            backoff_factor=0.3,
+            status_forcelist=[429],
+            allowed_methods=frozenset(['POST']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        self._session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retries))
+
+    def close(self):
+        """Close the underlying HTTP session."""
+        self._session.close()
+
+    def __enter__(self):
+        """Enter context manager.
+
+        Returns:
+            This webhook handler
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Exit context manager and close the session.
+
+        Args:
+            exc_type: Exception type, if one was raised
+            exc_val: Exception instance, if one was raised
+            exc_tb: Traceback, if an exception was raised
+        """
+        self.close()
+
     def send_message(self, content: str, webhook_url: Optional[str] = None) -> bool:
         """Send a message to Discord webhook.
 
@@ -58,10 +98,9 @@ class DiscordWebhook:
         }
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 url,
-                data=json.dumps(payload),
-                headers={"Content-Type": "application/json"},
+                json=payload,
                 timeout=10
             )
             response.raise_for_status()
@@ -101,7 +140,7 @@ class DiscordWebhook:
             self.logger.debug(f"Message level {level} below threshold {self.debug_level}, skipping")
             return False
 
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
         level_name = logging.getLevelName(level)
         formatted_message = f"[{timestamp}] **{level_name}**: {message}"
 
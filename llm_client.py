@@ -1,29 +1,101 @@
 """LLM client for generating reminder messages."""
 
+import json
 import logging
+import random
 import re
-from typing import Optional
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limiter import RateLimiter, detect_provider
+
+# Markers that indicate the LLM is generating examples/alternatives
+_EXAMPLE_RE = re.compile(
+    r'Lub:|Albo:|Lub tak:|Przykład:|Przykładowe|Może:|I jeszcze:|Następnie:|Lub też:|Ewentualnie:'
+    r'|Wersja \d+:|Opcja \d+:',
+    re.IGNORECASE
+)
+
+# Line-leading markers where a second variant starts
+_SEPARATORS = (
+    'Lub:', 'Lub tak:', 'Lub też:', 'Albo:', 'Może:', 'Przykład:',
+    'Następnie:', 'I jeszcze:', 'Ewentualnie:',
+)
+_SEPARATOR_RE = re.compile('\n(?:' + '|'.join(map(re.escape, _SEPARATORS)) + ')')
+
+# Markdown formatting, removed in this order: bold, italic, code
+_MARKDOWN_PATTERNS = (
+    re.compile(r'\*\*(.+?)\*\*'),
+    re.compile(r'\*(.+?)\*'),
+    re.compile(r'`(.+?)`'),
+)
+
+# Leading numbers/bullets (1., -, *, etc.)
+_BULLET_RE = re.compile(r'[\d\-*•]+[.)]\s*')
+
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+\s+')
+
+# Outermost JSON object/array in a reply that may add a code fence or prose around it
+_JSON_BODY_RE = re.compile(r'[\[{].*[\]}]', re.DOTALL)
+
+# HTTP statuses that mark a capacity/rate limit problem worth retrying
+_CAPACITY_STATUS_CODES = frozenset((429, 500, 502, 503, 504))
+
+# Fallback for errors without an HTTP status; codes are word-bounded so token
+# counts, request ids or URLs containing the digits don't match
+_CAPACITY_ERROR_RE = re.compile(
+    r'over capacity|rate limit|too many requests|service unavailable|internal_server_error'
+    r'|bad gateway|gateway timeout|timed out|\b(?:429|50[0234])\b',
+    re.IGNORECASE
+)
+
+
+# Read-only defaults per supported provider
+PROVIDER_CONFIGS = MappingProxyType({
+    'openai': MappingProxyType({
+        'default_base_url': 'https://api.openai.com/v1',
+        'default_model': 'gpt-4'
+    }),
+    'gemini': MappingProxyType({
+        'default_base_url': 'https://generativelanguage.googleapis.com',
+        'default_model': 'gemini-1.5-flash'
+    }),
+    'groq': MappingProxyType({
+        'default_base_url': 'https://api.groq.com/openai/v1',
+        'default_model': 'llama-3.1-70b-versatile'
+    })
+})
+
+# openai is only needed for OpenAI-compatible providers; imported on first use
+_openai = None
+
+
+def _get_openai():
+    """Import the openai package once and return it.
+
+    Returns:
+        The openai module
+    """
+    global _openai
+    if _openai is None:
+        import openai
+        _openai = openai
+    return _openai
 
 
 class LLMClient:
     """Client for interacting with LLM API to generate messages."""
 
-    PROVIDER_CONFIGS = {
-        'openai': {
-            'default_base_url': 'https://api.openai.com/v1',
-            'default_model': 'gpt-4'
-        },
-        'gemini': {
-            'default_base_url': 'https://generativelanguage.googleapis.com',
-            'default_model': 'gemini-1.5-flash'
-        },
-        'groq': {
-            'default_base_url': 'https://api.groq.com/openai/v1',
-            'default_model': 'llama-3.1-70b-versatile'
-        }
-    }
+    # Responses are only reused when sampling is effectively deterministic
+    RESPONSE_CACHE_MAX_TEMPERATURE = 0.05
+    RESPONSE_CACHE_SIZE = 256
+
+    PROVIDER_CONFIGS = PROVIDER_CONFIGS
 
     def __init__(
             self,
@@ -33,6 +105,10 @@ class LLMClient:
             base_url: Optional[str] = None,
             max_tokens: int = 500,
             temperature: float = 0.9,
+            request_timeout: float = 30.0,
+            requests_per_minute: Optional[int] = None,
+            max_concurrent: Optional[int] = None,
+            shutdown_event: Optional[threading.Event] = None,
             logger: Optional[logging.Logger] = None
     ):
         """Initialize LLM client.
@@ -44,24 +120,39 @@ class LLMClient:
             base_url: Base URL for API (uses provider default if not specified)
             max_tokens: Maximum tokens in response
             temperature: Sampling temperature (0-2)
+            request_timeout: Seconds to wait for a single API request before giving up
+            requests_per_minute: Client-side request limit (uses provider default if not specified)
+            max_concurrent: Maximum requests in flight (uses provider default if not specified)
+            shutdown_event: Event that, once set, interrupts retry backoff waits
             logger: Logger instance
         """
         self.provider = provider.lower()
         self.api_key = api_key
         self.max_tokens = max_tokens
         self.temperature = temperature
+        self.request_timeout = request_timeout
+        self._shutdown_event = shutdown_event
+        self._response_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._response_cache_lock = threading.Lock()  # generate_message() may run in worker threads
         self.logger = logger or logging.getLogger(__name__)
 
         # Validate provider
-        if self.provider not in self.PROVIDER_CONFIGS:
-            raise ValueError(f"Unsupported provider: {provider}. Supported: {list(self.PROVIDER_CONFIGS.keys())}")
+        if self.provider not in PROVIDER_CONFIGS:
+            raise ValueError(f"Unsupported provider: {provider}. Supported: {list(PROVIDER_CONFIGS.keys())}")
 
-        provider_config = self.PROVIDER_CONFIGS[self.provider]
+        provider_config = PROVIDER_CONFIGS[self.provider]
 
         # Set model and base_url with fallbacks to defaults
         self.model = model or provider_config['default_model']
         self.base_url = base_url or provider_config['default_base_url']
 
+        self._rate_limiter = RateLimiter(
+            detect_provider(self.provider, self.base_url),
+            requests_per_minute=requests_per_minute,
+            max_concurrent=max_concurrent,
+            logger=self.logger
+        )
+
         self.logger.info(f"Initialized LLM client: provider={self.provider}, model={self.model}")
 
         # Initialize client based on provider
@@ -71,18 +162,40 @@ class LLMClient:
             # OpenAI and Groq use OpenAI-compatible API - lazy import
             self._init_openai_compatible_client()
 
+    @property
+    def max_concurrent(self) -> int:
+        """Get the maximum number of requests this client sends at once."""
+        return self._rate_limiter.max_concurrent
+
     def _init_openai_compatible_client(self):
         """Initialize OpenAI-compatible client (OpenAI, Groq)."""
-        import openai
+        openai = _get_openai()
+        self._openai = openai
+        self._retryable_errors = (openai.RateLimitError, openai.APITimeoutError, openai.InternalServerError)
+        # _request_with_retries() is the only retry layer; SDK retries would multiply it
         self.client = openai.OpenAI(
             api_key=self.api_key,
-            base_url=self.base_url
+            base_url=self.base_url,
+            max_retries=0
         )
 
     def _init_gemini_client(self):
         """Initialize Gemini client (uses REST API directly)."""
         # Gemini uses a different API structure, we'll handle it separately
         self.client = None
+        self._retryable_errors = (requests.exceptions.Timeout,)
+
+        # Persistent session so retries and later calls reuse the TLS connection
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        self._gemini_url = f"{self.base_url}/v1beta/models/{self.model}:generateContent"
+
+        # Parts of the request that never change between calls
+        self._gemini_params = {"key": self.api_key}
+        self._gemini_generation_config = {
+            "temperature": self.temperature,
+            "maxOutputTokens": self.max_tokens,
+        }
 
     def _clean_message(self, raw_message: str) -> Optional[str]:
         """Clean and validate LLM output.
@@ -105,50 +218,30 @@ class LLMClient:
         # Log original for debugging
         if len(message) > 200:
             self.logger.warning(f"LLM returned long message ({len(message)} chars), attempting cleanup")
-            self.logger.debug(f"Original message: {message}")
-
-        # Patterns that indicate the LLM is generating examples/alternatives
-        example_patterns = [
-            r'Lub:',
-            r'Albo:',
-            r'Lub tak:',
-            r'Przykład:',
-            r'Przykładowe',
-            r'Może:',
-            r'I jeszcze:',
-            r'Następnie:',
-            r'Lub też:',
-            r'Ewentualnie:',
-            r'Wersja \d+:',
-            r'Opcja \d+:',
-        ]
-
-        # Check if message contains example indicators
-        has_examples = any(re.search(pattern, message, re.IGNORECASE) for pattern in example_patterns)
+            self.logger.debug("Original message: %s", message)
+
+        # Check if message contains example indicators. Every separator that
+        # can be cut at ends in a colon, so replies without one skip the regex.
+        has_examples = ':' in message and _EXAMPLE_RE.search(message) is not None
 
         if has_examples:
             self.logger.warning("Message contains example indicators, extracting first variant")
 
-            # Split by common separators and take first part
-            separators = ['\n\nLub:', '\n\nAlbo:', '\n\nMoże:', '\n\nPrzykład:',
-                          '\nLub:', '\nAlbo:', '\nMoże:', '\nNastępnie:', '\nI jeszcze:',
-                          '\n\nLub tak:', '\nLub też:', '\nEwentualnie:']
-
-            for separator in separators:
-                if separator in message:
-                    parts = message.split(separator)
-                    message = parts[0].strip()
-                    self.logger.info(
-                        f"Extracted first variant, reduced from {len(raw_message)} to {len(message)} chars")
-                    break
+            # Cut at the earliest separator and keep the first part
+            separator = _SEPARATOR_RE.search(message)
+            if separator:
+                message = message[:separator.start()].strip()
+                self.logger.info(
+                    f"Extracted first variant, reduced from {len(raw_message)} to {len(message)} chars")
 
         # Remove markdown formatting if present
-        message = re.sub(r'\*\*(.+?)\*\*', r'\1', message)  # Bold
-        message = re.sub(r'\*(.+?)\*', r'\1', message)  # Italic
-        message = re.sub(r'`(.+?)`', r'\1', message)  # Code
+        for pattern in _MARKDOWN_PATTERNS:
+            message = pattern.sub(r'\1', message)
 
         # Remove leading numbers/bullets (1., -, *, etc.)
-        message = re.sub(r'^[\d\-\*\•]+[\.\)]\s*', '', message)
+        bullet = _BULLET_RE.match(message)
+        if bullet:
+            message = message[bullet.end():]
 
         # Final cleanup
         message = message.strip()
@@ -157,7 +250,7 @@ class LLMClient:
         if len(message) > 500:
             self.logger.warning(f"Message still too long after cleanup ({len(message)} chars), taking first sentence")
             # Take first 1-2 sentences
-            sentences = re.split(r'[.!?]+\s+', message)
+            sentences = _SENTENCE_SPLIT_RE.split(message)
             if sentences:
                 # Take first sentence, or first two if first is very short
                 if len(sentences[0]) < 50 and len(sentences) > 1:
@@ -174,7 +267,7 @@ class LLMClient:
         # Log if we made significant changes
         if len(message) < len(raw_message) * 0.5:
             self.logger.info(f"Significantly reduced message length: {len(raw_message)} → {len(message)} chars")
-            self.logger.debug(f"Cleaned message: {message}")
+            self.logger.debug("Cleaned message: %s", message)
 
         return message
 
@@ -188,51 +281,143 @@ class LLMClient:
         Returns:
             Generated message or None if failed
         """
-        import time
+        cache_key = None
+        if self.temperature < self.RESPONSE_CACHE_MAX_TEMPERATURE:
+            cache_key = (self.provider, self.model, self.temperature, self.max_tokens, prompt)
+            with self._response_cache_lock:
+                cached = self._response_cache.get(cache_key)
+                if cached is not None:
+                    self._response_cache.move_to_end(cache_key)
+            if cached is not None:
+                self.logger.info("Reusing cached LLM response for identical deterministic prompt")
+                return cached
+
+        raw_message = self._request_with_retries(prompt, max_retries)
+        if not raw_message:
+            return None
 
-        for attempt in range(max_retries):
-            try:
-                self.logger.debug(
-                    f"Sending prompt to LLM (provider: {self.provider}, model: {self.model}, attempt: {attempt + 1}/{max_retries})")
+        # Clean and validate the message
+        cleaned_message = self._clean_message(raw_message)
 
-                if self.provider == 'gemini':
-                    raw_message = self._generate_gemini(prompt)
-                else:
-                    raw_message = self._generate_openai_compatible(prompt)
+        if not cleaned_message:
+            self.logger.error("Message cleanup failed, rejecting output")
+            return None
+
+        if cache_key is not None:
+            with self._response_cache_lock:
+                self._response_cache[cache_key] = cleaned_message
+                if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+                    self._response_cache.popitem(last=False)
+
+        self.logger.info(f"Successfully generated message ({len(cleaned_message)} chars)")
+        return cleaned_message
+
+    def generate_batch(self, prompt: str, count: int, max_retries: int = 3) -> List[str]:
+        """Generate several reminder messages with a single LLM request.
+
+        The model is asked for a JSON object with a "messages" array; each
+        entry is cleaned like a single message. The JSON is parsed from the
+        plain reply, as not every model accepts a JSON response format.
+        Callers should fall back to generate_message() for whatever this
+        doesn't return.
+
+        Args:
+            prompt: Prompt to send to LLM
+            count: Number of messages to request
+            max_retries: Maximum number of retry attempts for API errors
 
-                if not raw_message:
-                    return None
+        Returns:
+            Cleaned messages, at most count (empty if the output was unusable)
+        """
+        # Overrides the template's single-message output rule for this request
+        batch_prompt = (
+            f"{prompt}\n\n"
+            f"For this request, instead of a single message write {count} different messages, "
+            f"each following all the other instructions above. "
+            f'Output ONLY a JSON object with a "messages" key holding an array of {count} strings, nothing else.'
+        )
+        raw_output = self._request_with_retries(batch_prompt, max_retries, max_tokens=self.max_tokens * count)
+        if not raw_output:
+            return []
 
-                # Clean and validate the message
-                cleaned_message = self._clean_message(raw_message)
+        body = _JSON_BODY_RE.search(raw_output)
+        if body is None:
+            self.logger.warning("Batch response contains no JSON")
+            return []
 
-                if not cleaned_message:
-                    self.logger.error("Message cleanup failed, rejecting output")
-                    return None
+        try:
+            data = json.loads(body.group())
+        except json.JSONDecodeError as e:
+            self.logger.warning(f"Batch response is not valid JSON: {e}")
+            return []
+
+        items = data.get("messages") if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            self.logger.warning("Batch response has no message array")
+            return []
+
+        messages = []
+        for item in items:
+            if isinstance(item, str):
+                cleaned_message = self._clean_message(item)
+                if cleaned_message:
+                    messages.append(cleaned_message)
+
+        self.logger.info(f"Generated {len(messages)}/{count} messages in one request")
+        return messages[:count]
+
+    def _request_with_retries(
+            self,
+            prompt: str,
+            max_retries: int,
+            max_tokens: Optional[int] = None
+    ) -> Optional[str]:
+        """Send a prompt to the provider, retrying capacity errors with backoff.
 
-                self.logger.info(f"Successfully generated message ({len(cleaned_message)} chars)")
-                return cleaned_message
+        Args:
+            prompt: Prompt to send to LLM
+            max_retries: Maximum number of attempts
+            max_tokens: Response token limit (defaults to self.max_tokens)
+
+        Returns:
+            Raw response text, or None if the provider returned nothing
+        """
+        import time
+
+        for attempt in range(max_retries):
+            try:
+                self.logger.debug(
+                    "Sending prompt to LLM (provider: %s, model: %s, attempt: %d/%d)",
+                    self.provider, self.model, attempt + 1, max_retries)
+
+                if not self._rate_limiter.acquire(self._shutdown_event):
+                    self.logger.info("Shutdown requested, abandoning request")
+                    raise KeyboardInterrupt()
+
+                started = time.monotonic()
+                throttled = False
+                try:
+                    if self.provider == 'gemini':
+                        return self._generate_gemini(prompt, max_tokens)
+                    return self._generate_openai_compatible(prompt, max_tokens)
+                except Exception as e:
+                    throttled = self._is_capacity_error(e)
+                    raise
+                finally:
+                    self._rate_limiter.release(time.monotonic() - started, throttled)
 
             except Exception as e:
-                error_msg = str(e).lower()
-
-                # Check if it's a capacity/rate limit error (503, 429)
-                is_capacity_error = any(indicator in error_msg for indicator in [
-                    'over capacity',
-                    '503',
-                    'rate limit',
-                    '429',
-                    'too many requests',
-                    'service unavailable',
-                    'internal_server_error'
-                ])
-
-                if is_capacity_error and attempt < max_retries - 1:
-                    # Exponential backoff: 2, 4, 8 seconds
-                    wait_time = 2 ** (attempt + 1)
+                if self._is_capacity_error(e) and attempt < max_retries - 1:
+                    # Exponential backoff (2, 4, 8 seconds) plus up to 1 s of jitter so
+                    # concurrent requests that failed together don't retry together
+                    wait_time = 2 ** (attempt + 1) + random.uniform(0, 1)
                     self.logger.warning(f"API capacity error (attempt {attempt + 1}/{max_retries}): {e}")
-                    self.logger.info(f"Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
+                    self.logger.info(f"Retrying in {wait_time:.1f} seconds...")
+                    if self._shutdown_event is None:
+                        time.sleep(wait_time)
+                    elif self._shutdown_event.wait(wait_time):
+                        self.logger.info("Shutdown requested, abandoning retry")
+                        raise KeyboardInterrupt()
                     continue
                 else:
                     # Final attempt failed or non-retryable error
@@ -243,16 +428,42 @@ class LLMClient:
 
         return None
 
-    def _generate_openai_compatible(self, prompt: str) -> Optional[str]:
+    def _is_capacity_error(self, error: Exception) -> bool:
+        """Check whether an API error is a transient capacity/rate limit error.
+
+        Args:
+            error: Exception raised by the provider call
+
+        Returns:
+            True if the request should be retried after a backoff
+        """
+        if isinstance(error, self._retryable_errors):
+            return True
+
+        # openai.APIStatusError has status_code; requests' HTTPError carries the response
+        status_code = getattr(error, 'status_code', None)
+        if status_code is None:
+            status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+        if status_code is not None:
+            return status_code in _CAPACITY_STATUS_CODES
+
+        return _CAPACITY_ERROR_RE.search(str(error)) is not None
+
+    def _generate_openai_compatible(
+            self,
+            prompt: str,
+            max_tokens: Optional[int] = None
+    ) -> Optional[str]:
         """Generate message using OpenAI-compatible API (OpenAI, Groq).
 
         Args:
             prompt: Prompt to send
+            max_tokens: Response token limit (defaults to self.max_tokens)
 
         Returns:
             Generated message
         """
-        import openai
+        openai = self._openai
 
         try:
             response = self.client.chat.completions.create(
@@ -260,66 +471,60 @@ class LLMClient:
                 messages=[
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature
+                max_tokens=max_tokens or self.max_tokens,
+                temperature=self.temperature,
+                timeout=self.request_timeout
             )
 
             message = response.choices[0].message.content.strip()
-            self.logger.debug(
-                f"Raw LLM response: {message[:200]}..." if len(message) > 200 else f"Raw LLM response: {message}")
+            self.logger.debug("Raw LLM response: %.200s%s", message, "..." if len(message) > 200 else "")
 
             return message
 
-        except openai.APIError as e:
-            self.logger.error(f"API error: {e}")
-            raise
         except openai.RateLimitError as e:
             self.logger.error(f"Rate limit exceeded: {e}")
             raise
         except openai.APIConnectionError as e:
             self.logger.error(f"API connection error: {e}")
             raise
+        except openai.APIError as e:
+            self.logger.error(f"API error: {e}")
+            raise
 
-    def _generate_gemini(self, prompt: str) -> Optional[str]:
+    def _generate_gemini(
+            self,
+            prompt: str,
+            max_tokens: Optional[int] = None
+    ) -> Optional[str]:
         """Generate message using Google Gemini API.
 
         Args:
             prompt: Prompt to send
+            max_tokens: Response token limit (defaults to self.max_tokens)
 
         Returns:
             Generated message
         """
-        try:
-            # Gemini API endpoint
-            url = f"{self.base_url}/v1beta/models/{self.model}:generateContent"
-
-            headers = {
-                "Content-Type": "application/json"
-            }
-
-            # Add API key as query parameter for Gemini
-            params = {
-                "key": self.api_key
-            }
+        generation_config = self._gemini_generation_config
+        if max_tokens:
+            generation_config = {**generation_config, "maxOutputTokens": max_tokens}
 
+        try:
             payload = {
                 "contents": [{
                     "parts": [{
                         "text": prompt
                     }]
                 }],
-                "generationConfig": {
-                    "temperature": self.temperature,
-                    "maxOutputTokens": self.max_tokens,
-                }
+                "generationConfig": generation_config
             }
 
-            response = requests.post(
-                url,
-                headers=headers,
-                params=params,
+            # API key goes in the query string for Gemini
+            response = self._session.post(
+                self._gemini_url,
+                params=self._gemini_params,
                 json=payload,
-                timeout=30
+                timeout=self.request_timeout
             )
 
             response.raise_for_status()
@@ -330,8 +535,7 @@ class LLMClient:
                 candidate = result['candidates'][0]
                 if 'content' in candidate and 'parts' in candidate['content']:
                     message = candidate['content']['parts'][0]['text'].strip()
-                    self.logger.debug(f"Raw LLM response: {message[:200]}..." if len(
-                        message) > 200 else f"Raw LLM response: {message}")
+                    self.logger.debug("Raw LLM response: %.200s%s", message, "..." if len(message) > 200 else "")
                     return message
 
             self.logger.error("Unexpected Gemini API response structure")
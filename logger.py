@@ -15,6 +15,36 @@ try:
 except ImportError:
     COLORAMA_AVAILABLE = False
 
+# Default logger configuration; setup_logger() merges overrides into a copy
+_DEFAULT_CONFIG = {
+    'log_dir': 'logs',
+    'log_level': 'INFO',
+    'max_bytes': 10485760,
+    'backup_count': 5,
+    'console': {
+        'enabled': True,
+        'colored': True
+    },
+    'file': {
+        'enabled': True,
+        'include_timestamp': True,
+        'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        'date_format': '%Y-%m-%d %H:%M:%S'
+    }
+}
+
+_LEVELS = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+    'CRITICAL': logging.CRITICAL,
+    # Aliases the logging module also accepts
+    'WARN': logging.WARN,
+    'FATAL': logging.FATAL,
+    'NOTSET': logging.NOTSET,
+}
+
 
 class ANSIStripFormatter(logging.Formatter):
     """Formatter that strips ANSI escape codes for file logging."""
@@ -31,6 +61,9 @@ class ANSIStripFormatter(logging.Formatter):
             Formatted string without ANSI codes
         """
         formatted = super().format(record)
+        # Every escape sequence starts with ESC; skip the regex when there is none
+        if '\x1b' not in formatted:
+            return formatted
         return self.ANSI_ESCAPE_PATTERN.sub('', formatted)
 
 
@@ -44,6 +77,7 @@ class ColoredConsoleFormatter(logging.Formatter):
         'ERROR': Fore.RED if COLORAMA_AVAILABLE else '',
         'CRITICAL': Fore.RED + Style.BRIGHT if COLORAMA_AVAILABLE else '',
     }
+    _RESET = Style.RESET_ALL if COLORAMA_AVAILABLE else ''
 
     def __init__(self, fmt=None, datefmt=None, use_colors=True):
         """Initialize colored formatter.
@@ -56,6 +90,14 @@ class ColoredConsoleFormatter(logging.Formatter):
         super().__init__(fmt, datefmt)
         self.use_colors = use_colors and COLORAMA_AVAILABLE
 
+        # Pre-built (prefix, colored level name) per level
+        self._level_styles = {}
+        if self.use_colors:
+            self._level_styles = {
+                level: (color, f"{color}{level}{self._RESET}")
+                for level, color in self.COLORS.items()
+            }
+
     def format(self, record):
         """Format the record with colors.
 
@@ -65,13 +107,16 @@ class ColoredConsoleFormatter(logging.Formatter):
         Returns:
             Formatted colored string
         """
-        if self.use_colors:
-            levelname = record.levelname
-            if levelname in self.COLORS:
-                record.levelname = f"{self.COLORS[levelname]}{levelname}{Style.RESET_ALL}"
-                record.msg = f"{self.COLORS[levelname]}{record.msg}{Style.RESET_ALL}"
+        style = self._level_styles.get(record.levelname)
+        if style is None:
+            return super().format(record)
 
-        return super().format(record)
+        # Color a copy; the record itself is shared with the other handlers
+        color, colored_levelname = style
+        colored = logging.makeLogRecord(record.__dict__)
+        colored.levelname = colored_levelname
+        colored.msg = f"{color}{record.msg}{self._RESET}"
+        return super().format(colored)
 
 
 def setup_logger(
@@ -87,36 +132,14 @@ def setup_logger(
     Returns:
         Configured logger instance
     """
-    # Default configuration
-    default_config = {
-        'log_dir': 'logs',
-        'log_level': 'INFO',
-        'max_bytes': 10485760,
-        'backup_count': 5,
-        'console': {
-            'enabled': True,
-            'colored': True
-        },
-        'file': {
-            'enabled': True,
-            'include_timestamp': True,
-            'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            'date_format': '%Y-%m-%d %H:%M:%S'
-        }
-    }
-
-    # Merge with provided config
-    if config:
-        default_config.update(config)
-        if 'console' in config:
-            default_config['console'].update(config.get('console', {}))
-        if 'file' in config:
-            default_config['file'].update(config.get('file', {}))
-
-    cfg = default_config
+    # Merge with provided config; nested sections are merged key by key
+    config = config or {}
+    cfg = {**_DEFAULT_CONFIG, **config}
+    cfg['console'] = {**_DEFAULT_CONFIG['console'], **config.get('console', {})}
+    cfg['file'] = {**_DEFAULT_CONFIG['file'], **config.get('file', {})}
 
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, cfg['log_level'].upper()))
+    logger.setLevel(_LEVELS[cfg['log_level'].upper()])
 
     # Remove existing handlers
     logger.handlers.clear()
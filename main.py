@@ -1,7 +1,9 @@
 """Main reminder application."""
 
+import signal
 import sys
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
 
 from cache_manager import CacheManager
@@ -11,6 +13,9 @@ from llm_client import LLMClient
 from logger import setup_logger
 from scheduler import ReminderScheduler
 
+# Upper bound for a single wait in the main loop
+MAX_WAIT_SECONDS = 600
+
 
 class ReminderApp:
     """Main application for AI-powered reminders."""
@@ -34,8 +39,11 @@ class ReminderApp:
         self.logger.info("AI Reminder Application Starting")
         self.logger.info("=" * 60)
 
-        # Flag to prevent multiple simultaneous sends
-        self._is_sending = False
+        # Held while a reminder is being sent to prevent simultaneous sends
+        self._send_lock = threading.Lock()
+
+        # Set on shutdown to interrupt waits (main loop, LLM retry backoff)
+        self._shutdown_event = threading.Event()
 
         # Initialize components
         self._initialize_components()
@@ -59,6 +67,10 @@ class ReminderApp:
                 base_url=self.config.llm_base_url,
                 max_tokens=self.config.llm_max_tokens,
                 temperature=self.config.llm_temperature,
+                request_timeout=self.config.llm_request_timeout,
+                requests_per_minute=self.config.llm_requests_per_minute,
+                max_concurrent=self.config.llm_max_concurrent,
+                shutdown_event=self._shutdown_event,
                 logger=self.logger
             )
 
@@ -124,24 +136,95 @@ class ReminderApp:
         self.logger.info(f"Initializing cache with {needed} messages...")
 
         success_count = 0
-        for i in range(needed):
-            self.logger.info(f"Generating message {i + 1}/{needed}...")
-
-            message = self._generate_and_cache_message()
-            if message:
-                success_count += 1
+        # Write messages.json once when prefill ends instead of after every message
+        with self.cache.batch():
+            if needed > 1 and self.config.llm_batch_prefill:
+                success_count = self._prefill_cache_batch(needed)
+
+            # Generate whatever the batch request didn't return one by one
+            remaining = needed - success_count
+            workers = min(self.llm.max_concurrent, remaining)
+            if workers > 1:
+                success_count += self._prefill_cache_concurrently(remaining, workers)
             else:
-                self.logger.warning(f"Failed to generate message {i + 1}")
+                for i in range(remaining):
+                    self.logger.info(f"Generating message {i + 1}/{remaining}...")
 
-            # Small delay between requests
-            if i < needed - 1:
-                time.sleep(1)
+                    message = self._generate_and_cache_message()
+                    if message:
+                        success_count += 1
+                    else:
+                        self.logger.warning(f"Failed to generate message {i + 1}")
 
         self.logger.info(f"Cache initialization complete: {success_count}/{needed} messages generated")
 
         if success_count == 0:
             raise RuntimeError("Failed to generate any cache messages")
 
+    def _prefill_cache_batch(self, needed: int) -> int:
+        """Generate several messages with one LLM request and add them to the cache.
+
+        Args:
+            needed: Number of messages to generate
+
+        Returns:
+            Number of messages added to the cache
+        """
+        recent_messages = self.cache.get_recent_sent_messages(count=5)
+        prompt = self.config.get_prompt(recent_messages=recent_messages)
+
+        try:
+            messages = self.llm.generate_batch(prompt, needed)
+        except Exception as e:
+            self.logger.warning(f"Batch generation failed, falling back to single requests: {e}")
+            return 0
+
+        return self.cache.add_messages(messages) if messages else 0
+
+    def _prefill_cache_concurrently(self, needed: int, workers: int) -> int:
+        """Generate messages in parallel and add them to the cache.
+
+        Only the LLM requests run in worker threads; results are added to
+        the cache and errors reported from the calling thread.
+
+        Args:
+            needed: Number of messages to generate
+            workers: Maximum number of requests in flight
+
+        Returns:
+            Number of messages added to the cache
+        """
+        # Sent history doesn't change during prefill, so every request shares one prompt
+        recent_messages = self.cache.get_recent_sent_messages(count=5)
+        prompt = self.config.get_prompt(recent_messages=recent_messages)
+
+        success_count = 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-prefill") as executor:
+            futures = [executor.submit(self.llm.generate_message, prompt) for _ in range(needed)]
+
+            try:
+                for i, future in enumerate(as_completed(futures), 1):
+                    try:
+                        message = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Error generating message: {e}")
+                        self.webhook.send_error("Failed to generate message from LLM", e)
+                        message = None
+
+                    if message and self.cache.add_message(message):
+                        success_count += 1
+                        self.logger.info(f"Generated message {i}/{needed}")
+                    else:
+                        self.logger.warning(f"Failed to generate message {i}/{needed}")
+            except BaseException:
+                # Ctrl+C etc.: drop queued requests and stop in-flight retries
+                # instead of letting the executor run them all on exit
+                self._shutdown_event.set()
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        return success_count
+
     def _send_reminder(self) -> bool:
         """Send a reminder message.
 
@@ -149,12 +232,11 @@ class ReminderApp:
             True if successful, False otherwise
         """
         # Prevent multiple simultaneous sends
-        if self._is_sending:
+        if not self._send_lock.acquire(blocking=False):
             self.logger.warning("Already sending a reminder, skipping duplicate send attempt")
             return False
 
         try:
-            self._is_sending = True
             self.logger.info("=" * 60)
             self.logger.info("Starting reminder send process")
 
@@ -199,7 +281,7 @@ class ReminderApp:
             self.webhook.send_error("Error sending reminder", e)
             return False
         finally:
-            self._is_sending = False
+            self._send_lock.release()
 
     def _refill_cache(self):
         """Refill cache with one new message if needed."""
@@ -214,8 +296,20 @@ class ReminderApp:
             else:
                 self.logger.warning("Failed to refill cache")
 
+    def _handle_sigterm(self, signum, frame):
+        """Request a clean shutdown when SIGTERM is received.
+
+        Args:
+            signum: Signal number
+            frame: Current stack frame
+        """
+        self.logger.info("Received SIGTERM, shutting down")
+        self._shutdown_event.set()
+
     def run(self):
         """Run the main application loop."""
+        signal.signal(signal.SIGTERM, self._handle_sigterm)
+
         try:
             # Initialize cache
             self._initialize_cache()
@@ -226,16 +320,18 @@ class ReminderApp:
             self.logger.info("Application running. Press Ctrl+C to stop.")
 
             # Main loop
-            while True:
+            while not self._shutdown_event.is_set():
                 if self.scheduler.should_send_reminder():
                     self.logger.debug("Scheduler indicates it's time to send reminder")
                     self._send_reminder()
                     self.logger.debug("Scheduling next reminder")
                     self.scheduler.schedule_next_reminder()
 
-                # Wait before next check
-                interval = self.scheduler.get_next_check_interval()
-                time.sleep(interval)
+                # Sleep until the reminder is due; shutdown wakes us early
+                timeout = min(max(self.scheduler.get_seconds_until_next(), 1), MAX_WAIT_SECONDS)
+                self._shutdown_event.wait(timeout)
+
+            self.logger.info("Application stopped")
 
         except KeyboardInterrupt:
             self.logger.info("\nApplication stopped by user")
@@ -244,6 +340,10 @@ class ReminderApp:
             self.logger.error(f"Application error: {e}", exc_info=True)
             self.webhook.send_error("Application crashed", e)
             raise
+        finally:
+            # Make sure the cache is on disk before the process exits
+            self.cache.flush(sync=True)
+            self.webhook.close()
 
 
 def main():
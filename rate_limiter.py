@@ -0,0 +1,178 @@
+"""Client-side rate limiting for LLM API requests."""
+
+import logging
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional
+
+
+@dataclass(frozen=True)
+class ProviderProfile:
+    """Default request limits and AIMD tuning for an LLM provider.
+
+    Attributes:
+        name: Profile name
+        requests_per_minute: Requests allowed in any 60 s window (0 = unlimited)
+        max_concurrent: Upper bound for requests in flight
+        latency_target: Requests slower than this (seconds) don't raise the limit
+        increase_step: Added to the concurrency limit after a fast success
+        decrease_factor: Multiplies the concurrency limit after a throttling error
+    """
+
+    name: str
+    requests_per_minute: int
+    max_concurrent: int
+    latency_target: float
+    increase_step: int = 1
+    decrease_factor: float = 0.5
+
+
+# Conservative defaults based on the providers' entry-level tiers
+PROVIDER_PROFILES = {
+    'openai': ProviderProfile('openai', requests_per_minute=500, max_concurrent=8, latency_target=20.0),
+    'gemini': ProviderProfile('gemini', requests_per_minute=15, max_concurrent=4, latency_target=15.0),
+    'groq': ProviderProfile('groq', requests_per_minute=30, max_concurrent=4, latency_target=5.0),
+    'local': ProviderProfile('local', requests_per_minute=0, max_concurrent=2, latency_target=60.0),
+}
+
+_GENERIC_PROFILE = ProviderProfile('generic', requests_per_minute=60, max_concurrent=4, latency_target=20.0)
+
+# Base URL patterns, checked before the provider name so that e.g. an
+# OpenAI-compatible server on localhost gets the local profile
+_BASE_URL_PROFILES = (
+    (re.compile(r'api\.openai\.com'), 'openai'),
+    (re.compile(r'generativelanguage\.googleapis\.com'), 'gemini'),
+    (re.compile(r'api\.groq\.com'), 'groq'),
+    (re.compile(r'//(?:localhost|127\.0\.0\.1|\[::1\])[:/]|:11434\b'), 'local'),
+)
+
+_WINDOW_SECONDS = 60.0
+
+
+def detect_provider(provider: str, base_url: Optional[str] = None) -> ProviderProfile:
+    """Pick the limit profile for a provider.
+
+    Args:
+        provider: Provider name (openai, gemini, groq)
+        base_url: API base URL, if known
+
+    Returns:
+        Matching provider profile, or a generic one
+    """
+    if base_url:
+        for pattern, name in _BASE_URL_PROFILES:
+            if pattern.search(base_url):
+                return PROVIDER_PROFILES[name]
+    return PROVIDER_PROFILES.get(provider, _GENERIC_PROFILE)
+
+
+class RateLimiter:
+    """Thread-safe request limiter with a sliding RPM window and AIMD concurrency.
+
+    The concurrency limit grows by increase_step after each request that
+    completes within the latency target and is cut by decrease_factor when
+    the provider reports throttling or overload.
+    """
+
+    def __init__(
+            self,
+            profile: ProviderProfile,
+            requests_per_minute: Optional[int] = None,
+            max_concurrent: Optional[int] = None,
+            logger: Optional[logging.Logger] = None
+    ):
+        """Initialize rate limiter.
+
+        Args:
+            profile: Provider defaults
+            requests_per_minute: Override for the profile's RPM (0 = unlimited)
+            max_concurrent: Override for the profile's concurrency ceiling
+            logger: Logger instance
+        """
+        self.profile = profile
+        self.requests_per_minute = (profile.requests_per_minute if requests_per_minute is None
+                                    else requests_per_minute)
+        self.max_concurrent = max(1, profile.max_concurrent if max_concurrent is None else max_concurrent)
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._limit = float(self.max_concurrent)
+        self._in_flight = 0
+        self._started: Deque[float] = deque()  # monotonic start times within the window
+        self._condition = threading.Condition()
+
+    @property
+    def concurrency_limit(self) -> int:
+        """Get the current AIMD concurrency limit."""
+        return max(1, int(self._limit))
+
+    def _seconds_until_window_frees(self, now: float) -> float:
+        """Drop expired timestamps and return how long until a request may start.
+
+        Must be called with the condition held.
+
+        Args:
+            now: Current monotonic time
+
+        Returns:
+            Seconds to wait for the RPM window, 0 if a request may start now
+        """
+        started = self._started
+        while started and now - started[0] >= _WINDOW_SECONDS:
+            started.popleft()
+        if not self.requests_per_minute or len(started) < self.requests_per_minute:
+            return 0.0
+        return _WINDOW_SECONDS - (now - started[0])
+
+    def acquire(self, shutdown_event: Optional[threading.Event] = None) -> bool:
+        """Block until a request may be sent, then reserve a slot.
+
+        Args:
+            shutdown_event: Event that, once set, abandons the wait
+
+        Returns:
+            True if a slot was reserved, False if shutdown was requested
+        """
+        with self._condition:
+            while True:
+                if shutdown_event is not None and shutdown_event.is_set():
+                    return False
+
+                now = time.monotonic()
+                if self._in_flight < self.concurrency_limit:
+                    window_wait = self._seconds_until_window_frees(now)
+                    if window_wait == 0:
+                        self._in_flight += 1
+                        self._started.append(now)
+                        return True
+                    self.logger.debug("Request rate limit reached, waiting %.1fs", window_wait)
+                    timeout = window_wait
+                else:
+                    timeout = None
+
+                # Wake periodically so a shutdown isn't missed
+                if shutdown_event is not None:
+                    timeout = 1.0 if timeout is None else min(timeout, 1.0)
+                self._condition.wait(timeout)
+
+    def release(self, latency: float, throttled: bool = False):
+        """Free a slot reserved by acquire() and adjust the concurrency limit.
+
+        Args:
+            latency: Seconds the request took
+            throttled: Whether the provider rejected it as rate limited/overloaded
+        """
+        with self._condition:
+            self._in_flight -= 1
+            previous = self.concurrency_limit
+
+            if throttled:
+                self._limit = max(1.0, self._limit * self.profile.decrease_factor)
+            elif latency <= self.profile.latency_target:
+                self._limit = min(float(self.max_concurrent), self._limit + self.profile.increase_step)
+
+            if self.concurrency_limit != previous:
+                self.logger.info(f"LLM concurrency limit {previous} -> {self.concurrency_limit}")
+            self._condition.notify_all()
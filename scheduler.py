@@ -2,9 +2,13 @@
 
 import logging
 import random
+import re
 from datetime import datetime, time, timedelta
 from typing import Optional
 
+# HH:MM with hour 0-23 (leading zero optional) and minute 00-59
+_TIME_RE = re.compile(r'([01]?\d|2[0-3]):([0-5]\d)')
+
 
 class ReminderScheduler:
     """Scheduler for managing when reminders should be sent."""
@@ -31,6 +35,10 @@ class ReminderScheduler:
         self.range_start = self._parse_time(time_range_start)
         self.range_end = self._parse_time(time_range_end) if randomize else self.range_start
 
+        # Range bounds as minutes since midnight
+        self._start_minutes = self.range_start.hour * 60 + self.range_start.minute
+        self._end_minutes = self.range_end.hour * 60 + self.range_end.minute
+
         self.next_reminder_time: Optional[datetime] = None
         self._reminder_sent_today = False  # Flag to prevent double sending
 
@@ -48,12 +56,11 @@ class ReminderScheduler:
         Returns:
             Time object
         """
-        try:
-            hour, minute = map(int, time_str.split(':'))
-            return time(hour=hour, minute=minute)
-        except (ValueError, AttributeError) as e:
-            self.logger.error(f"Invalid time format '{time_str}': {e}")
+        match = _TIME_RE.fullmatch(time_str) if isinstance(time_str, str) else None
+        if match is None:
+            self.logger.error(f"Invalid time format '{time_str}'")
             raise ValueError(f"Time must be in HH:MM format, got: {time_str}")
+        return time(hour=int(match.group(1)), minute=int(match.group(2)))
 
     def _generate_random_time(self, date: datetime.date) -> datetime:
         """Generate random time within configured range for given date.
@@ -64,17 +71,10 @@ class ReminderScheduler:
         Returns:
             Random datetime within time range
         """
-        # Convert time objects to minutes since midnight
-        start_minutes = self.range_start.hour * 60 + self.range_start.minute
-        end_minutes = self.range_end.hour * 60 + self.range_end.minute
-
         # Generate random minute within range
-        random_minutes = random.randint(start_minutes, end_minutes)
+        hour, minute = divmod(random.randint(self._start_minutes, self._end_minutes), 60)
 
-        hour = random_minutes // 60
-        minute = random_minutes % 60
-
-        return datetime.combine(date, time(hour=hour, minute=minute))
+        return datetime(date.year, date.month, date.day, hour, minute)
 
     def _generate_fixed_time(self, date: datetime.date) -> datetime:
         """Generate fixed time for given date.
@@ -134,6 +134,8 @@ class ReminderScheduler:
             self.schedule_next_reminder()
             return False
 
+        # Compared against the wall clock on every check, so an NTP step after
+        # boot or time spent suspended is picked up on the next wake
         now = datetime.now()
 
         if now >= self.next_reminder_time:
@@ -164,27 +166,7 @@ class ReminderScheduler:
         if self.next_reminder_time is None:
             return 0
 
-        now = datetime.now()
-        delta = self.next_reminder_time - now
-        return max(0, delta.total_seconds())
-
-    def get_next_check_interval(self) -> int:
-        """Get recommended interval for next check in seconds.
-
-        Returns number of seconds to wait before checking again.
-        Checks more frequently as we get closer to reminder time.
+        # Aware datetimes so the delay is real elapsed time across DST changes
+        delay = self.next_reminder_time.astimezone() - datetime.now().astimezone()
+        return max(0, delay.total_seconds())
 
-        Returns:
-            Seconds to wait before next check
-        """
-        seconds_until = self.get_seconds_until_next()
-
-        # If more than 1 hour away, check every 5 minutes
-        if seconds_until > 3600:
-            return 300
-        # If more than 10 minutes away, check every minute
-        elif seconds_until > 600:
-            return 60
-        # If close, check every 30 seconds (changed from 10 to reduce double-send risk)
-        else:
-            return 30
@@ -2,10 +2,20 @@
 """Utility script to inspect and repair the message cache."""
 
 import json
+import mmap
+import os
+import shutil
 import sys
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 def load_cache(cache_path: Path):
     """Load cache file.
@@ -17,8 +27,14 @@ def load_cache(cache_path: Path):
         Cache data or None if failed
     """
     try:
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        if ORJSON_AVAILABLE:
+            with open(cache_path, 'rb') as f:
+                # mmap() rejects empty files; those fall through to json.loads below
+                if os.fstat(f.fileno()).st_size:
+                    # orjson parses straight from the mapped pages, no read() copy
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                        return orjson.loads(view)
+        return json.loads(cache_path.read_bytes())
     except FileNotFoundError:
         print(f"❌ Cache file not found: {cache_path}")
         return None
@@ -35,13 +51,35 @@ def save_cache(cache_path: Path, cache_data):
         cache_data: Data to save
     """
     try:
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            json.dump(cache_data, f, indent=2, ensure_ascii=False)
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(cache_data, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(cache_data, indent=2, ensure_ascii=False).encode('utf-8')
+        cache_path.write_bytes(data)
         print(f"✓ Cache saved successfully")
     except Exception as e:
         print(f"❌ Failed to save cache: {e}")
 
 
+def backup_cache(cache_path: Path, backup_path: Path) -> bool:
+    """Copy the cache file as it is on disk.
+
+    Args:
+        cache_path: Path to cache file
+        backup_path: Path to write the backup to
+
+    Returns:
+        True if the backup was written
+    """
+    try:
+        shutil.copyfile(cache_path, backup_path)
+        print(f"✓ Backup saved successfully")
+        return True
+    except OSError as e:
+        print(f"❌ Failed to create backup: {e}")
+        return False
+
+
 def inspect_cache(cache_path: Path):
     """Inspect cache and show statistics.
 
@@ -63,52 +101,55 @@ def inspect_cache(cache_path: Path):
         print("   Cache is empty")
         return
 
-    # Validate structure
+    # Validate structure and collect message previews in one pass
     valid_entries = 0
     invalid_entries = 0
     empty_messages = 0
+    previews = []
+    out = []  # per-entry lines, printed in one write
 
     for i, entry in enumerate(cache):
         if not isinstance(entry, dict):
             invalid_entries += 1
-            print(f"   ⚠️  Entry {i}: Not a dict")
+            out.append(f"   ⚠️  Entry {i}: Not a dict")
             continue
 
         if "message" not in entry:
             invalid_entries += 1
-            print(f"   ⚠️  Entry {i}: Missing 'message' key")
+            out.append(f"   ⚠️  Entry {i}: Missing 'message' key")
             continue
 
-        if not isinstance(entry["message"], str):
+        msg = entry["message"]
+        previews.append((i, entry.get("timestamp", "Unknown"), msg))
+
+        if not isinstance(msg, str):
             invalid_entries += 1
-            print(f"   ⚠️  Entry {i}: 'message' is not a string")
+            out.append(f"   ⚠️  Entry {i}: 'message' is not a string")
             continue
 
-        if not entry["message"].strip():
+        if not msg.strip():
             empty_messages += 1
-            print(f"   ⚠️  Entry {i}: Empty message")
+            out.append(f"   ⚠️  Entry {i}: Empty message")
             continue
 
         valid_entries += 1
 
-    print(f"\n   Valid entries: {valid_entries}")
-    print(f"   Invalid entries: {invalid_entries}")
-    print(f"   Empty messages: {empty_messages}")
+    out.append(f"\n   Valid entries: {valid_entries}")
+    out.append(f"   Invalid entries: {invalid_entries}")
+    out.append(f"   Empty messages: {empty_messages}")
 
     # Show messages
-    print(f"\n📝 Messages in cache:")
-    for i, entry in enumerate(cache):
-        if isinstance(entry, dict) and "message" in entry:
-            msg = entry["message"]
-            timestamp = entry.get("timestamp", "Unknown")
+    out.append(f"\n📝 Messages in cache:")
+    for i, timestamp, msg in previews:
+        out.append(f"\n   [{i}] {timestamp}")
 
-            print(f"\n   [{i}] {timestamp}")
+        # Show first 100 chars of message
+        if len(msg) > 100:
+            out.append(f"   {msg[:100]}...")
+        else:
+            out.append(f"   {msg}")
 
-            # Show first 100 chars of message
-            if len(msg) > 100:
-                print(f"   {msg[:100]}...")
-            else:
-                print(f"   {msg}")
+    print(*out, sep="\n")
 
 
 def repair_cache(cache_path: Path):
@@ -131,32 +172,33 @@ def repair_cache(cache_path: Path):
     # Filter valid entries
     valid_cache = []
     seen_messages = set()
+    out = []  # per-entry lines, printed in one write
 
     for i, entry in enumerate(cache):
         # Check if entry is valid dict
         if not isinstance(entry, dict):
-            print(f"   ⚠️  Removing entry {i}: Not a dict")
+            out.append(f"   ⚠️  Removing entry {i}: Not a dict")
             continue
 
         # Check if has message key
         if "message" not in entry:
-            print(f"   ⚠️  Removing entry {i}: Missing 'message' key")
+            out.append(f"   ⚠️  Removing entry {i}: Missing 'message' key")
             continue
 
         # Check if message is string
         if not isinstance(entry["message"], str):
-            print(f"   ⚠️  Removing entry {i}: 'message' is not a string")
+            out.append(f"   ⚠️  Removing entry {i}: 'message' is not a string")
             continue
 
         # Check if message is not empty
         msg = entry["message"].strip()
         if not msg:
-            print(f"   ⚠️  Removing entry {i}: Empty message")
+            out.append(f"   ⚠️  Removing entry {i}: Empty message")
             continue
 
         # Check for duplicates
         if msg in seen_messages:
-            print(f"   ⚠️  Removing entry {i}: Duplicate message")
+            out.append(f"   ⚠️  Removing entry {i}: Duplicate message")
             continue
 
         seen_messages.add(msg)
@@ -164,10 +206,13 @@ def repair_cache(cache_path: Path):
         # Add timestamp if missing
         if "timestamp" not in entry:
             entry["timestamp"] = datetime.now().isoformat()
-            print(f"   ℹ️  Added timestamp to entry {i}")
+            out.append(f"   ℹ️  Added timestamp to entry {i}")
 
         valid_cache.append(entry)
 
+    if out:
+        print(*out, sep="\n")
+
     repaired_count = len(valid_cache)
     removed_count = original_count - repaired_count
 
@@ -179,7 +224,8 @@ def repair_cache(cache_path: Path):
         # Backup original
         backup_path = cache_path.with_suffix('.json.backup')
         print(f"\n💾 Creating backup: {backup_path}")
-        save_cache(backup_path, cache)
+        if not backup_cache(cache_path, backup_path):
+            return
 
         # Save repaired cache
         print(f"💾 Saving repaired cache: {cache_path}")
@@ -217,7 +263,8 @@ def clear_cache(cache_path: Path):
     # Backup original
     backup_path = cache_path.with_suffix('.json.backup')
     print(f"\n💾 Creating backup: {backup_path}")
-    save_cache(backup_path, cache)
+    if not backup_cache(cache_path, backup_path):
+        return
 
     # Clear cache
     print(f"🗑️  Clearing cache: {cache_path}")
@@ -1,74 +1,185 @@
 #!/usr/bin/env python3
 """Script to clean up malformed messages in cache."""
 
+import argparse
 import json
+import shutil
 import sys
 from pathlib import Path
 import re
+from typing import Iterator, Optional, Tuple
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Patterns that indicate multiple examples
+_SEPARATORS = (
+    '\n\nLub:',
+    '\n\nAlbo:',
+    '\n\nMoże:',
+    '\n\nPrzykład:',
+    '\nLub:',
+    '\nAlbo:',
+    '\nMoże:',
+    '\nNastępnie:',
+    '\nI jeszcze:',
+    '\nLub tak:',
+    '\nLub też:',
+    '\nEwentualnie:',
+    '\nPotem:',
+    '\nI znów:',
+    '\nI tak dalej:',
+    '\nPrzykładowe',
+)
+
+# Example indicators that mark a cached message as malformed
+_MALFORMED_INDICATORS = (
+    '\n\nLub:', '\nLub:', '\n\nAlbo:', '\nAlbo:',
+    '\n\nPrzykład:', '\nPrzykład:', 'Przykładowe'
+)
+
+# Both lists in one alternation, each pattern tagged (is separator, contains an
+# indicator). Only separators start with a newline inside another pattern, so
+# tagging by containment catches every indicator the scan steps over.
+_SCAN_PATTERNS = {
+    pattern: (pattern in _SEPARATORS, any(indicator in pattern for indicator in _MALFORMED_INDICATORS))
+    for pattern in _SEPARATORS + _MALFORMED_INDICATORS
+}
+_SCAN_RE = re.compile('|'.join(map(re.escape, _SCAN_PATTERNS)))
+
+# Markdown formatting, removed in this order: bold, italic, code
+_MARKDOWN_PATTERNS = (
+    re.compile(r'\*\*(.+?)\*\*'),
+    re.compile(r'\*(.+?)\*'),
+    re.compile(r'`(.+?)`'),
+)
+
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+\s+')
+
+
+def _trunc(text: str, limit: int = 100) -> str:
+    """Shorten text for a preview, marking the cut with an ellipsis.
 
+    Args:
+        text: Text to shorten
+        limit: Maximum number of characters kept from the text
+
+    Returns:
+        Text unchanged if it fits, otherwise its first limit characters followed by '...'
+    """
+    return text if len(text) <= limit else f"{text[:limit]}..."
+
+
+def _encode_entry(entry) -> bytes:
+    """Serialize one cache entry as indented UTF-8 JSON.
+
+    Args:
+        entry: Cache entry to serialize
+
+    Returns:
+        Encoded JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(entry, option=orjson.OPT_INDENT_2)
+    return json.dumps(entry, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def iter_encoded_cache(cache_data) -> Iterator[bytes]:
+    """Yield the indented JSON encoding of the cache list one entry at a time.
+
+    The chunks join to the same bytes as encoding the whole list at once.
+
+    Args:
+        cache_data: List of cache entries
+
+    Yields:
+        Encoded JSON chunks
+    """
+    if not cache_data:
+        yield b'[]'
+        return
 
-def clean_message(message: str) -> str:
+    yield b'['
+    for i, entry in enumerate(cache_data):
+        yield b',\n  ' if i else b'\n  '
+        # JSON strings escape newlines, so every raw newline is indentation
+        yield _encode_entry(entry).replace(b'\n', b'\n  ')
+    yield b'\n]'
+
+
+def scan_message(message: str) -> Tuple[int, bool]:
+    """Find the first variant separator and any example indicator in one pass.
+
+    Args:
+        message: Message to scan
+
+    Returns:
+        Tuple of (position of the earliest separator or -1, whether the
+        message contains an example indicator)
+    """
+    cut = -1
+    is_malformed = False
+
+    for match in _SCAN_RE.finditer(message):
+        is_separator, is_indicator = _SCAN_PATTERNS[match.group()]
+        if is_separator and cut == -1:
+            cut = match.start()
+        is_malformed = is_malformed or is_indicator
+        if cut != -1 and is_malformed:
+            break
+
+    return cut, is_malformed
+
+
+def clean_message(message: str, cut: Optional[int] = None) -> str:
     """Clean a malformed message by extracting only the first variant.
 
     Args:
         message: Potentially malformed message
+        cut: Separator position from scan_message(), if already known
 
     Returns:
         Cleaned message
     """
-    # Patterns that indicate multiple examples
-    separators = [
-        '\n\nLub:',
-        '\n\nAlbo:',
-        '\n\nMoże:',
-        '\n\nPrzykład:',
-        '\nLub:',
-        '\nAlbo:',
-        '\nMoże:',
-        '\nNastępnie:',
-        '\nI jeszcze:',
-        '\nLub tak:',
-        '\nLub też:',
-        '\nEwentualnie:',
-        '\nPotem:',
-        '\nI znów:',
-        '\nI tak dalej:',
-        '\nPrzykładowe',
-    ]
-
-    # Find the earliest separator
-    first_sep_pos = len(message)
-    for sep in separators:
-        pos = message.find(sep)
-        if pos != -1 and pos < first_sep_pos:
-            first_sep_pos = pos
+    if cut is None:
+        cut, _ = scan_message(message)
 
-    # Extract first part
-    if first_sep_pos < len(message):
-        cleaned = message[:first_sep_pos].strip()
-    else:
+    # Nothing to cut and no markdown: only the length check can change anything
+    if cut == -1 and '*' not in message and '`' not in message:
         cleaned = message.strip()
+        if len(cleaned) <= 300:
+            return cleaned
+
+    # Extract first part
+    cleaned = (message[:cut] if cut != -1 else message).strip()
 
     # Remove markdown formatting
-    cleaned = re.sub(r'\*\*(.+?)\*\*', r'\1', cleaned)
-    cleaned = re.sub(r'\*(.+?)\*', r'\1', cleaned)
-    cleaned = re.sub(r'`(.+?)`', r'\1', cleaned)
+    for pattern in _MARKDOWN_PATTERNS:
+        cleaned = pattern.sub(r'\1', cleaned)
 
-    # If still too long, take first 2 sentences
+    # If still too long, take first 2 sentences; only their boundaries are needed
     if len(cleaned) > 300:
-        sentences = re.split(r'[.!?]+\s+', cleaned)
-        if len(sentences) > 1:
-            cleaned = sentences[0] + '. ' + sentences[1]
+        first = _SENTENCE_SPLIT_RE.search(cleaned)
+        if first:
+            second = _SENTENCE_SPLIT_RE.search(cleaned, first.end())
+            end = second.start() if second else len(cleaned)
+            cleaned = f"{cleaned[:first.start()]}. {cleaned[first.end():end]}"
             if not cleaned.endswith(('.', '!', '?')):
                 cleaned += '.'
-        else:
-            cleaned = sentences[0]
 
     return cleaned.strip()
 
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Clean up malformed messages in the message cache.")
+    parser.add_argument('-q', '--quiet', action='store_true', help="don't print details for each fixed message")
+    args = parser.parse_args()
+
     cache_path = Path("../cache/messages.json")
 
     if not cache_path.exists():
@@ -81,8 +192,8 @@ def main():
 
     # Load cache
     try:
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            cache = json.load(f)
+        data = cache_path.read_bytes()
+        cache = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
     except Exception as e:
         print(f"❌ Failed to load cache: {e}")
         sys.exit(1)
@@ -92,34 +203,36 @@ def main():
     # Analyze messages
     malformed_count = 0
     fixed_messages = []
+    out = []  # per-entry lines, printed in one write
 
     for i, entry in enumerate(cache):
         if not isinstance(entry, dict) or 'message' not in entry:
-            print(f"⚠️  Skipping invalid entry {i}")
+            out.append(f"⚠️  Skipping invalid entry {i}")
             continue
 
         original = entry['message']
 
         # Check if malformed (contains example indicators)
-        is_malformed = any(sep in original for sep in [
-            '\n\nLub:', '\nLub:', '\n\nAlbo:', '\nAlbo:',
-            '\n\nPrzykład:', '\nPrzykład:', 'Przykładowe'
-        ])
+        cut, is_malformed = scan_message(original)
 
         if is_malformed or len(original) > 300:
             malformed_count += 1
-            cleaned = clean_message(original)
+            cleaned = clean_message(original, cut)
 
-            print(f"\n📝 Message {i}:")
-            print(f"   Original length: {len(original)} chars")
-            print(f"   Cleaned length: {len(cleaned)} chars")
-            print(f"   Original: {original[:100]}...")
-            print(f"   Cleaned: {cleaned[:100]}..." if len(cleaned) > 100 else f"   Cleaned: {cleaned}")
+            if not args.quiet:
+                out.append(f"\n📝 Message {i}:")
+                out.append(f"   Original length: {len(original)} chars")
+                out.append(f"   Cleaned length: {len(cleaned)} chars")
+                out.append(f"   Original: {_trunc(original)}")
+                out.append(f"   Cleaned: {_trunc(cleaned)}")
 
             entry['message'] = cleaned
 
         fixed_messages.append(entry)
 
+    if out:
+        print(*out, sep="\n")
+
     print(f"\n📊 Results:")
     print(f"   Total messages: {len(cache)}")
     print(f"   Malformed messages: {malformed_count}")
@@ -138,13 +251,16 @@ def main():
     # Backup original
     backup_path = cache_path.with_suffix('.json.backup-cleanup')
     print(f"\n💾 Creating backup: {backup_path}")
-    with open(backup_path, 'w', encoding='utf-8') as f:
-        json.dump(cache, f, indent=2, ensure_ascii=False)
+    try:
+        shutil.copyfile(cache_path, backup_path)
+    except OSError as e:
+        print(f"❌ Failed to create backup: {e}")
+        sys.exit(1)
 
     # Save cleaned cache
     print(f"💾 Saving cleaned cache: {cache_path}")
-    with open(cache_path, 'w', encoding='utf-8') as f:
-        json.dump(fixed_messages, f, indent=2, ensure_ascii=False)
+    with open(cache_path, 'wb', buffering=1 << 20) as f:
+        f.writelines(iter_encoded_cache(fixed_messages))
 
     print(f"\n✓ Done! Fixed {malformed_count} messages")
 